@@ -1,24 +1,49 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import errno
 import json
 import os
-import shutil
+import re
 import sys
-import textwrap
 import time
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-try:
-    from rich import print
-except Exception:
-    print = print
-    pass
-
 DEFAULT_ROOT = "/mnt/c/Users/Rubens/AppData/Roaming/Code/User/prompts"
 CONFIG_PATH = Path.home() / ".promptcli.json"
 SUFFIX = ".prompt.md"
+_SUFFIX_LEN = len(SUFFIX)
+# upper bound on concurrent frontmatter reads in `list -v`
+FM_READ_WORKERS = 16
+# bytes read up front when looking for frontmatter
+FM_PREFIX_BYTES = 4096
+# bump whenever parse_frontmatter output or the cache layout changes
+FM_CACHE_VERSION = 1
+# opening line, then the block up to a line that is just "---"
+_FM_RE = re.compile(
+    rb"\A---[^\n]*\n(.*?)^[ \t]*---[ \t]*\r?$", re.DOTALL | re.MULTILINE
+)
+# "key: value" lines, skipping blanks and "#" comments
+_KV_RE = re.compile(
+    rb"^[ \t]*([^#\s:][^:\n]*?)[ \t]*:[ \t]*(.*?)[ \t\r]*$", re.MULTILINE
+)
+
+# Config parsed once per process; written back at exit only if modified.
+# "last_bytes" is what the config file is known to hold, to skip no-op writes.
+_CFG_STATE: Dict = {"cfg": None, "dirty": False, "last_bytes": None}
+
+
+def _print(*args, **kwargs) -> None:
+    """print() via rich when available; rich is only imported on first use."""
+    global _print
+    try:
+        from rich import print as rich_print
+    except Exception:
+        rich_print = print
+    _print = rich_print
+    rich_print(*args, **kwargs)
 
 
 def detect_vscode_user_prompts_path() -> Path:
@@ -102,19 +127,70 @@ def detect_vscode_user_prompts_path() -> Path:
 
 
 def load_config() -> Dict:
+    if _CFG_STATE["cfg"] is not None:
+        return _CFG_STATE["cfg"]
+    cfg: Dict = {}
     if CONFIG_PATH.exists():
         try:
-            return json.loads(CONFIG_PATH.read_text())
+            raw = CONFIG_PATH.read_bytes()
+            cfg = json.loads(raw)
+            _CFG_STATE["last_bytes"] = raw
         except Exception:
-            return {}
-    return {}
+            cfg = {}
+    _CFG_STATE["cfg"] = cfg
+    return cfg
 
 
 def save_config(cfg: Dict) -> None:
+    # write a sibling temp file and swap it in, so the config is never torn
+    data = json.dumps(cfg, separators=(",", ":")).encode()
+    if data == _CFG_STATE["last_bytes"]:
+        return
     try:
-        CONFIG_PATH.write_text(json.dumps(cfg, indent=2))
+        _atomic_write(CONFIG_PATH, data)
+        _CFG_STATE["last_bytes"] = data
     except Exception as e:
-        print(f"Failed to write config: {e}", file=sys.stderr)
+        _print(f"Failed to write config: {e}", file=sys.stderr)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write data to a sibling temp file, then os.replace it over path."""
+    import tempfile
+
+    # unique temp name, so concurrent writers never share (and steal) a file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".")
+    try:
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _mark_dirty(cfg: Dict) -> None:
+    """Record that cfg changed; the write is deferred to _flush_config."""
+    _CFG_STATE["cfg"] = cfg
+    _CFG_STATE["dirty"] = True
+
+
+def _flush_config() -> None:
+    if _CFG_STATE["dirty"] and _CFG_STATE["cfg"] is not None:
+        save_config(_CFG_STATE["cfg"])
+        _CFG_STATE["dirty"] = False
+
+
+def _with_suffix(name: str) -> str:
+    return name if name.endswith(SUFFIX) else name + SUFFIX
+
+
+def _strip_suffix(name: str) -> str:
+    return name[:-_SUFFIX_LEN] if name.endswith(SUFFIX) else name
 
 
 def get_root(config: Dict) -> Path:
@@ -133,15 +209,43 @@ def trash_dir_for(root: Path) -> Path:
     return d
 
 
+def _trash_name(stem: str) -> str:
+    # nanosecond stamp keeps repeated trashing of the same name from colliding
+    return f"{time.time_ns()}_{stem}"
+
+
+def _fast_move(src: Path, dst: Path) -> None:
+    """Move src to dst, using a single atomic rename when possible.
+
+    Falls back to shutil.move (copy + unlink) only for cross-device moves.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        import shutil
+
+        shutil.move(src, dst)
+
+
+def _send_to_trash(root: Path, path: Path, name: str | None = None) -> Path:
+    """Move path into root's trash (created on demand); return its new path."""
+    target = trash_dir_for(root) / _trash_name(name or path.name)
+    _fast_move(path, target)
+    return target
+
+
 def add_file(root: Path, src: Path, cfg: Dict, force: bool = False) -> Tuple[bool, str]:
     if not src.exists():
         return False, f"File not found: {src}"
 
-    base = src.name
-    if not base.endswith(SUFFIX):
-        base = base + SUFFIX
+    base = _with_suffix(src.name)
 
     dest = root / base
+    # adding a file that already is the prompt: nothing to move or undo
+    if src.resolve() == dest.resolve():
+        return True, f"already present: {base}"
 
     overwritten_trash = None
     if dest.exists():
@@ -151,21 +255,18 @@ def add_file(root: Path, src: Path, cfg: Dict, force: bool = False) -> Tuple[boo
             if ans.strip().lower() not in ("y", "yes"):
                 return False, "aborted"
         # move existing to trash and record for undo
-        td = trash_dir_for(root)
-        tname = f"{int(time.time())}_{dest.name}"
-        overwritten_trash = td / tname
         try:
-            shutil.move(str(dest), str(overwritten_trash))
+            overwritten_trash = _send_to_trash(root, dest)
         except Exception as e:
             return False, f"Failed to move existing prompt to trash: {e}"
 
     try:
-        shutil.move(str(src), str(dest))
+        _fast_move(src, dest)
     except Exception as e:
         # attempt to restore overwritten file if we moved it
         if overwritten_trash and overwritten_trash.exists():
             try:
-                shutil.move(str(overwritten_trash), str(dest))
+                _fast_move(overwritten_trash, dest)
             except Exception:
                 pass
         return False, f"Failed to move: {e}"
@@ -179,16 +280,16 @@ def add_file(root: Path, src: Path, cfg: Dict, force: bool = False) -> Tuple[boo
     if overwritten_trash:
         cfg_last["overwritten_trash"] = str(overwritten_trash)
     cfg["last_action"] = cfg_last
-    save_config(cfg)
+    _mark_dirty(cfg)
 
-    name_no_suffix = base[: -len(SUFFIX)] if base.endswith(SUFFIX) else base
+    name_no_suffix = _strip_suffix(base)
     return True, f"added prompt {base}\nuse /{name_no_suffix} to use it"
 
 
 def remove_prompt(
     root: Path, name: str, cfg: Dict, yes: bool = False
 ) -> Tuple[bool, str]:
-    candidate = name if name.endswith(SUFFIX) else name + SUFFIX
+    candidate = _with_suffix(name)
     p = root / candidate
     if not p.exists():
         return False, f"Not found: {candidate}"
@@ -196,24 +297,23 @@ def remove_prompt(
         ans = input(f"Remove {p}? [y/N]: ")
         if ans.strip().lower() not in ("y", "yes"):
             return False, "aborted"
-    td = trash_dir_for(root)
-    tname = f"{int(time.time())}_{p.name}"
-    trashed = td / tname
     try:
-        shutil.move(str(p), str(trashed))
+        trashed = _send_to_trash(root, p)
     except Exception as e:
         return False, f"Failed to remove (move to trash): {e}"
 
     cfg["last_action"] = {"action": "remove", "dest": str(p), "trashed": str(trashed)}
-    save_config(cfg)
+    _mark_dirty(cfg)
     return True, f"removed {candidate} (moved to trash)"
 
 
 def copy_prompt(root: Path, name: str, out: Path) -> Tuple[bool, str]:
-    candidate = name if name.endswith(SUFFIX) else name + SUFFIX
+    candidate = _with_suffix(name)
     p = root / candidate
     if not p.exists():
         return False, f"Not found: {candidate}"
+    import shutil
+
     try:
         shutil.copy2(str(p), str(out))
     except Exception as e:
@@ -224,8 +324,8 @@ def copy_prompt(root: Path, name: str, out: Path) -> Tuple[bool, str]:
 def rename_prompt(
     root: Path, old: str, new: str, cfg: Dict, force: bool = False
 ) -> Tuple[bool, str]:
-    old_candidate = old if old.endswith(SUFFIX) else old + SUFFIX
-    new_candidate = new if new.endswith(SUFFIX) else new + SUFFIX
+    old_candidate = _with_suffix(old)
+    new_candidate = _with_suffix(new)
     p_old = root / old_candidate
     p_new = root / new_candidate
     if not p_old.exists():
@@ -236,23 +336,20 @@ def rename_prompt(
             if ans.strip().lower() not in ("y", "yes"):
                 return False, "aborted"
         # move existing new to trash
-        td = trash_dir_for(root)
-        tname = f"{int(time.time())}_{p_new.name}"
-        overwritten = td / tname
         try:
-            shutil.move(str(p_new), str(overwritten))
+            overwritten = _send_to_trash(root, p_new)
         except Exception as e:
             return False, f"Failed to move existing target to trash: {e}"
     else:
         overwritten = None
 
     try:
-        shutil.move(str(p_old), str(p_new))
+        _fast_move(p_old, p_new)
     except Exception as e:
         # try restore overwritten if moved
         if overwritten and overwritten.exists():
             try:
-                shutil.move(str(overwritten), str(p_new))
+                _fast_move(overwritten, p_new)
             except Exception:
                 pass
         return False, f"Failed to rename: {e}"
@@ -260,7 +357,7 @@ def rename_prompt(
     cfg["last_action"] = {"action": "rename", "old": str(p_old), "new": str(p_new)}
     if overwritten:
         cfg["last_action"]["overwritten_trash"] = str(overwritten)
-    save_config(cfg)
+    _mark_dirty(cfg)
     return True, f"renamed {old_candidate} -> {new_candidate}"
 
 
@@ -279,11 +376,11 @@ def perform_undo(cfg: Dict) -> Tuple[bool, str]:
             # restore
             dest_parent = dest.parent
             dest_parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(trashed), str(dest))
+            _fast_move(trashed, dest)
         except Exception as e:
             return False, f"failed to restore: {e}"
         cfg.pop("last_action", None)
-        save_config(cfg)
+        _mark_dirty(cfg)
         return True, f"restored {dest.name}"
 
     if action == "add":
@@ -297,13 +394,11 @@ def perform_undo(cfg: Dict) -> Tuple[bool, str]:
             if overwritten:
                 overwritten_p = Path(overwritten)
                 if overwritten_p.exists():
-                    shutil.move(str(overwritten_p), str(dest))
-                    # move the new added file to trash
-                    td = trash_dir_for(dest.parent)
-                    tname = f"{int(time.time())}_{dest.name}.added"
-                    shutil.move(str(dest), str(td / tname))
+                    # trash the added file before restoring over its path
+                    _send_to_trash(dest.parent, dest, dest.name + ".added")
+                    _fast_move(overwritten_p, dest)
                     cfg.pop("last_action", None)
-                    save_config(cfg)
+                    _mark_dirty(cfg)
                     return (
                         True,
                         "restored overwritten prompt and moved new added file to trash",
@@ -313,17 +408,17 @@ def perform_undo(cfg: Dict) -> Tuple[bool, str]:
                 try:
                     dest_parent = Path(src).parent
                     dest_parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(dest), str(src))
+                    _fast_move(dest, Path(src))
                     cfg.pop("last_action", None)
-                    save_config(cfg)
+                    _mark_dirty(cfg)
                     return True, f"moved {dest.name} back to {src}"
                 except Exception:
                     pass
             # fallback: move to current directory
             fallback = Path.cwd() / dest.name
-            shutil.move(str(dest), str(fallback))
+            _fast_move(dest, fallback)
             cfg.pop("last_action", None)
-            save_config(cfg)
+            _mark_dirty(cfg)
             return True, f"moved {dest.name} to {fallback}"
         except Exception as e:
             return False, f"failed to undo add: {e}"
@@ -333,58 +428,138 @@ def perform_undo(cfg: Dict) -> Tuple[bool, str]:
 
 def parse_frontmatter(md_path: Path) -> Dict[str, str]:
     data: Dict[str, str] = {}
+    # frontmatter sits at the top, so a small prefix is almost always enough
     try:
-        text = md_path.read_text(encoding="utf-8")
-    except Exception:
+        fd = os.open(md_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            raw = os.read(fd, FM_PREFIX_BYTES)
+            if not raw.startswith(b"---"):
+                return data
+            m = _FM_RE.match(raw)
+            # a match ending exactly at a truncated prefix may be a partial line
+            if len(raw) == FM_PREFIX_BYTES and (m is None or m.end() == len(raw)):
+                chunks = [raw]
+                while chunk := os.read(fd, 65536):
+                    chunks.append(chunk)
+                raw = b"".join(chunks)
+                m = _FM_RE.match(raw)
+        finally:
+            os.close(fd)
+    except OSError:
         return data
 
-    if not text.startswith("---"):
-        return data
+    if m is not None:
+        block = m.group(1)
+    else:
+        # unterminated frontmatter: everything after the opening line
+        nl = raw.find(b"\n")
+        block = raw[nl + 1 :] if nl >= 0 else b""
 
-    lines = text.splitlines()
-    i = 1
-    while i < len(lines):
-        line = lines[i].strip()
-        if line == "---":
-            break
-        if not line or line.startswith("#"):
-            i += 1
-            continue
-        if ":" in line:
-            k, v = line.split(":", 1)
-            k = k.strip()
-            v = v.strip().strip('"').strip("'")
-            data[k] = v
-        i += 1
+    for k, v in _KV_RE.findall(block):
+        v = v.decode("utf-8", errors="replace").strip('"').strip("'")
+        data[k.decode("utf-8", errors="replace")] = v
 
     return data
 
 
-def list_prompts(root: Path, verbose: bool, show_files: bool = False) -> None:
-    if not root.exists():
-        print("(no prompts directory)")
-        return
+def frontmatter_cache_path(root: Path) -> Path:
+    return root / ".cache" / "frontmatter.json"
 
-    file_list = sorted(
-        [p for p in root.iterdir() if p.is_file() and p.name.endswith(SUFFIX)]
-    )
 
-    if not verbose and not show_files:
-        for p in file_list:
-            print(p.name[: -len(SUFFIX)])
+def load_frontmatters(root: Path, entries: List[os.DirEntry]) -> List[Dict[str, str]]:
+    """Return parsed frontmatter for each entry, in order.
+
+    Results are cached on disk keyed by name, mtime and size, so unchanged
+    files are not re-read. The cache is rewritten only when it changed, and
+    is discarded when its FM_CACHE_VERSION does not match.
+    """
+    cache_path = frontmatter_cache_path(root)
+    try:
+        stored = json.loads(cache_path.read_bytes())
+        # a cache from another format/parser version is stale: start over
+        if stored.get("v") != FM_CACHE_VERSION:
+            raise ValueError("frontmatter cache version mismatch")
+        cache = stored["entries"]
+        if not isinstance(cache, dict):
+            cache = {}
+    except Exception:
+        cache = {}
+
+    keys: List[str | None] = []
+    for e in entries:
+        try:
+            st = e.stat()
+        except OSError:
+            # removed or renamed since the scan: list it with no frontmatter
+            keys.append(None)
+            continue
+        keys.append(f"{e.name}:{st.st_mtime_ns}:{st.st_size}")
+
+    # anything that isn't a parsed dict (hand-edited, corrupt) is re-read
+    misses = [
+        i
+        for i, k in enumerate(keys)
+        if k is not None and not isinstance(cache.get(k), dict)
+    ]
+    paths = [Path(entries[i].path) for i in misses]
+    # reads are latency bound, so keep several in flight; map() preserves order
+    if len(paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(FM_READ_WORKERS, len(paths))) as ex:
+            parsed = list(ex.map(parse_frontmatter, paths))
+    else:
+        parsed = [parse_frontmatter(p) for p in paths]
+    for i, fm in zip(misses, parsed):
+        cache[keys[i]] = fm
+
+    # keep only current entries so renamed/edited files don't accumulate
+    fresh = {k: cache[k] for k in keys if k is not None}
+    if misses or len(fresh) != len(cache):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            stored = {"v": FM_CACHE_VERSION, "entries": fresh}
+            data = json.dumps(stored, separators=(",", ":")).encode()
+            _atomic_write(cache_path, data)
+        except OSError:
+            pass
+    return [fresh[k] if k is not None else {} for k in keys]
+
+
+def _write_lines(lines: List[str]) -> None:
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def list_prompts(root: Path, verbose: bool, show_files: bool = False) -> None:
+    # DirEntry caches the file type from readdir, so is_file() is usually free
+    try:
+        with os.scandir(root) as it:
+            file_list = [e for e in it if e.name.endswith(SUFFIX) and e.is_file()]
+    except FileNotFoundError:
+        sys.stdout.write("(no prompts directory)\n")
         return
 
-    if not verbose and show_files:
-        for p in file_list:
-            name = p.name[: -len(SUFFIX)]
-            print(f"{name}\t{p.name}")
+    # collect lines and emit them with one write; plain columns need no rich markup
+    out: List[str] = []
+
+    if not verbose:
+        # plain listings only need names: no stats, no Path objects
+        names = sorted(e.name for e in file_list)
+        if show_files:
+            out = [f"{fname[:-_SUFFIX_LEN]}\t{fname}" for fname in names]
+        else:
+            out = [fname[:-_SUFFIX_LEN] for fname in names]
+        _write_lines(out)
         return
 
+    file_list.sort(key=lambda e: e.name)
+    fms = load_frontmatters(root, file_list)
+
     rows: List[Dict[str, str]] = []
     keys = set()
-    for p in file_list:
-        fm = parse_frontmatter(p)
-        row = {"name": p.name[: -len(SUFFIX)], **fm}
+    for e, fm in zip(file_list, fms):
+        row = {"name": e.name[:-_SUFFIX_LEN], **fm}
         rows.append(row)
         keys.update(row.keys())
 
@@ -394,6 +569,8 @@ def list_prompts(root: Path, verbose: bool, show_files: bool = False) -> None:
     other = sorted(k for k in keys if k not in cols)
     cols.extend(other)
 
+    import textwrap
+
     MAX_WIDTH = 40
 
     def cell_lines(val: str) -> List[str]:
@@ -419,20 +596,18 @@ def list_prompts(root: Path, verbose: bool, show_files: bool = False) -> None:
         max(len(col_lines[c][i]) for c in cols) for i in range(len(rows))
     ]
 
-    header = " | ".join(c.ljust(widths[c]) for c in cols)
+    # widths are fixed from here on, so build the row format once
+    fmt = " | ".join(f"{{:<{widths[c]}}}" for c in cols)
     sep = "-+-".join("-" * widths[c] for c in cols)
-    print(header)
-    print(sep)
+    out.append(fmt.format(*cols))
+    out.append(sep)
 
-    for i, r in enumerate(rows):
-        lines_count = row_line_counts[i]
-        for ln in range(lines_count):
-            parts = []
-            for c in cols:
-                cell = col_lines[c][i]
-                part = cell[ln] if ln < len(cell) else ""
-                parts.append(part.ljust(widths[c]))
-            print(" | ".join(parts))
+    for i in range(len(rows)):
+        cells = [col_lines[c][i] for c in cols]
+        for ln in range(row_line_counts[i]):
+            parts = [cell[ln] if ln < len(cell) else "" for cell in cells]
+            out.append(fmt.format(*parts))
+    _write_lines(out)
 
 
 def main(argv=None):
@@ -499,6 +674,9 @@ def main(argv=None):
 
     args = parser.parse_args(argv)
 
+    # unregister first so repeated main() calls don't stack flush handlers
+    atexit.unregister(_flush_config)
+    atexit.register(_flush_config)
     cfg = load_config()
     root = get_root(cfg)
 
@@ -509,24 +687,24 @@ def main(argv=None):
         if not bool(getattr(args, "yes", False)):
             ans = input(f"Set prompts root to {detected} {status}? [Y/n]: ")
             if ans.strip().lower() not in ("y", "yes", ""):
-                print("aborted")
+                _print("aborted")
                 return 1
         # ensure directory exists
         try:
             detected.mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            print(f"Failed to create directory {detected}: {e}", file=sys.stderr)
+            _print(f"Failed to create directory {detected}: {e}", file=sys.stderr)
             return 1
         cfg["root"] = str(detected)
-        save_config(cfg)
-        print(f"root set to: {detected}")
+        _mark_dirty(cfg)
+        _print(f"root set to: {detected}")
         return 0
 
     if args.cmd == "setroot":
         new_root = Path(args.path).expanduser()
         cfg["root"] = str(new_root)
-        save_config(cfg)
-        print(f"root set to: {new_root}")
+        _mark_dirty(cfg)
+        _print(f"root set to: {new_root}")
         return 0
 
     ensure_root(root)
@@ -538,24 +716,24 @@ def main(argv=None):
             cfg,
             force=bool(getattr(args, "force", False)),
         )
-        print(msg)
+        _print(msg)
         return 0 if ok else 1
 
     if args.cmd == "remove":
         ok, msg = remove_prompt(
             root, args.name, cfg, yes=bool(getattr(args, "yes", False))
         )
-        print(msg)
+        _print(msg)
         return 0 if ok else 1
 
     if args.cmd == "undo":
         ok, msg = perform_undo(cfg)
-        print(msg)
+        _print(msg)
         return 0 if ok else 1
 
     if args.cmd == "copy":
         ok, msg = copy_prompt(root, args.name, Path(args.out).expanduser())
-        print(msg)
+        _print(msg)
         return 0 if ok else 1
 
     if args.cmd == "list":
@@ -566,7 +744,7 @@ def main(argv=None):
         ok, msg = rename_prompt(
             root, args.old, args.new, cfg, force=bool(getattr(args, "force", False))
         )
-        print(msg)
+        _print(msg)
         return 0 if ok else 1
 
     parser.print_help()